@@ -1,12 +1,34 @@
 from __future__ import annotations
 
-import datetime, json, pathlib, random, shutil, sys, re, os
+import atexit, datetime, heapq, io, json, logging, pathlib, random, sys, re, os
+from   collections.abc import Iterator
+from   concurrent.futures import ProcessPoolExecutor
 import tkinter as tk
 from   tkinter import filedialog, messagebox
 
 import numpy as np, pandas as pd, openpyxl
+from   openpyxl.cell import WriteOnlyCell
 from   openpyxl.utils import get_column_letter
-from   openpyxl.styles import PatternFill                       # NEW
+from   openpyxl.styles import NamedStyle, PatternFill           # NEW
+
+try:                                  # optional: Rust-backed JSON encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+try:                                  # optional: fast writer for template-less workbooks
+    import pyexcelerate
+except ImportError:
+    pyexcelerate = None
+
+log = logging.getLogger(__name__)
+
+
+def _json_bytes(obj) -> bytes:
+    """Indented JSON as UTF-8 bytes – orjson when installed, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  Seat catalogue – mirrors the visual grid
@@ -73,8 +95,22 @@ SEATS: dict[str, dict[str, object]] = {
        for n in range(1, 16)},
 }
 
+# Flat views of the catalogue for the hot paths (one hash probe per lookup)
+ADJUSTABLE_SEATS = frozenset(s for s, m in SEATS.items() if m["adjustable"])
+SEATS_BY_TYPE: dict[str, tuple[str, ...]] = {
+    t: tuple(s for s, m in SEATS.items() if m["type"] == t)
+    for t in dict.fromkeys(m["type"] for m in SEATS.values())
+}
+CC_ROOMS         = tuple(s for s in SEATS if s.startswith("CC Room"))
+MAIN_PR          = tuple(s for s in SEATS_BY_TYPE.get("pr", ()) if s not in CC_ROOMS)
+# Seat → number / type as Series for vectorised lookups over a whole column;
+# object dtype keeps the ints intact when a lookup misses (NaN)
+SEAT_NUMBER_LUT  = pd.Series({s: m["seat_number"] for s, m in SEATS.items()}, dtype=object)
+SEAT_TYPE_LUT    = pd.Series({s: m["type"] for s, m in SEATS.items()})
+
 # ───────────────────────────── Constants ──────────────────────────────────
 TIME_FORMAT_EXCEL = "h:mm AM/PM"      # makes 22:00 look like 10:00 PM
+TIME_STYLE        = "Seat Time"       # named style carrying TIME_FORMAT_EXCEL
 COLOR_BY_TYPE   = {                   # SHA=yellow, SAS=blue, …
     "sha": "FFF2CC",
     "sas": "DDEBF7",
@@ -82,16 +118,61 @@ COLOR_BY_TYPE   = {                   # SHA=yellow, SAS=blue, …
     "ws":  "FCE4D6",
     "reg": None,                      # no colour for regular seats
 }
+FILL_BY_TYPE = {t: PatternFill("solid", fgColor="FF" + c)   # 8-digit ARGB, opaque
+                for t, c in COLOR_BY_TYPE.items() if c}
 MIN_COL_WIDTH = 10
+HDR_ROW       = 2                     # template header row; data starts below it
+DEFAULT_TEMPLATE = pathlib.Path(__file__).with_name("May 5, 2025.xlsx")
+RNG           = np.random.default_rng()   # seat tiebreaks; one generator per run
+KEYWORDS = {                          # cohort flag → Test Accommodation pattern
+    "pr":     r"Private Room",
+    "ws":     r"Read and Write|MS Word|Kurzweil",
+    "scribe": r"Scribe",
+    "final":  r"Final",
+    "sas":    r"SAS|Special|Individual|Separate|Extra Time|Alternative|Modified",
+}
+# Compiled once; pandas' str.contains accepts the pattern objects as-is
+KEYWORD_RES      = {key: re.compile(pattern, re.IGNORECASE) for key, pattern in KEYWORDS.items()}
+HEIGHT_ADJ_RE    = re.compile(r"Height Adjustable", re.IGNORECASE)
+HEADERS = ['Begin Time', 'End Time', 'Student Number', 'Student Last Name', 'Student First Name',
+           'Check-IN Time', 'Check-OUT Time', 'Course', 'Code', 'Test Room', 'Seat Number',
+           'Faculty Name', 'Class Time', 'Test Accommodation', 'Invigilator Comment', 'Test Comment']
+STUDENT_COLUMNS = {                   # Excel column → roster field copied into it
+    1: 'Begin Time', 2: 'End Time', 3: 'Student Number', 4: 'Student Last Name',
+    5: 'Student First Name', 8: 'Course', 9: 'Code', 12: 'Faculty Name',
+    13: 'Class Time', 14: 'Test Accommodation',
+}
+ROSTER_COLUMNS = frozenset(STUDENT_COLUMNS.values())   # all read_source keeps
+TIME_COLUMNS = tuple(col for col, field in STUDENT_COLUMNS.items()
+                     if field in ("Begin Time", "End Time", "Class Time"))
 
 # ───────────────────────────── GUI helpers ──────────────────────────────────
+_ROOT: tk.Tk | None | bool = None     # shared hidden root; False = no display
+
+def _ensure_root() -> tk.Tk:
+    """Return the one hidden Tk root, creating it on first use.
+
+    Raises tk.TclError when no display is available (and remembers that,
+    so headless runs don't retry Tk for every prompt).
+    """
+    global _ROOT
+    if _ROOT is False:
+        raise tk.TclError("no display")
+    if _ROOT is None:
+        try:
+            _ROOT = tk.Tk()
+        except tk.TclError:
+            _ROOT = False
+            raise
+        _ROOT.withdraw()
+        atexit.register(_ROOT.destroy)
+    return _ROOT
+
 def pick_file(title: str, patterns: tuple[tuple[str, str], ...]) -> str:
     """Choose a file via Tk when possible, otherwise fall back to CLI input."""
     try:
-        root = tk.Tk(); root.withdraw()
-        path = filedialog.askopenfilename(title=title, filetypes=patterns)
-        root.destroy()
-        return path
+        return filedialog.askopenfilename(parent=_ensure_root(),
+                                          title=title, filetypes=patterns)
     except tk.TclError:
         # Headless environment – ask in the terminal
         return input(f"{title}: ")
@@ -99,10 +180,7 @@ def pick_file(title: str, patterns: tuple[tuple[str, str], ...]) -> str:
 def pick_folder(title: str) -> str:
     """Choose a folder via Tk when possible, otherwise fall back to CLI."""
     try:
-        root = tk.Tk(); root.withdraw()
-        folder = filedialog.askdirectory(title=title)
-        root.destroy()
-        return folder
+        return filedialog.askdirectory(parent=_ensure_root(), title=title)
     except tk.TclError:
         return input(f"{title}: ")
 
@@ -110,10 +188,7 @@ def pick_folder(title: str) -> str:
 def ask_yes_no(title: str, message: str, default: bool = False) -> bool:
     """Display a yes/no dialog or fall back to terminal input."""
     try:
-        root = tk.Tk(); root.withdraw()
-        result = messagebox.askyesno(title, message)
-        root.destroy()
-        return bool(result)
+        return bool(messagebox.askyesno(title, message, parent=_ensure_root()))
     except tk.TclError:
         prompt = f"{title}: {message} [{'Y/n' if default else 'y/N'}]: "
         resp = input(prompt)
@@ -129,7 +204,7 @@ def choose_room_preferences() -> dict[str, bool]:
     falls back to simple yes/no prompts in the terminal.
     """
     try:
-        root = tk.Tk()
+        root = tk.Toplevel(_ensure_root())
         root.title("Select Room Types")
         vars_ = {
             'private_rooms':   tk.BooleanVar(value=True),
@@ -157,7 +232,7 @@ def choose_room_preferences() -> dict[str, bool]:
             root.destroy()
 
         tk.Button(root, text="OK", command=_ok).pack(pady=5)
-        root.mainloop()
+        root.wait_window()
         return prefs
     except tk.TclError:
         # Terminal fallback
@@ -181,163 +256,394 @@ def choose_room_preferences() -> dict[str, bool]:
 # ───────────────────────────── Data ingest ──────────────────────────────────
 def read_source(path: str) -> pd.DataFrame:
     """Load roster, tag 'Requires Adjustable', coerce time-like columns."""
-    df = (pd.read_csv(path, header=1)
+    # Only parse the columns that are used later; a callable (unlike a list)
+    # doesn't fail on rosters that lack one of them
+    keep = ROSTER_COLUMNS.__contains__
+    df = (pd.read_csv(path, header=1, usecols=keep)
           if path.lower().endswith(".csv")
-          else pd.read_excel(path, header=1))
+          else pd.read_excel(path, header=1, usecols=keep))
 
     df["Requires Adjustable"] = (
         df["Test Accommodation"]
-        .str.contains("Height Adjustable", case=False, na=False)
+        .str.contains(HEIGHT_ADJ_RE, na=False)
     )
 
-    def to_time(col: str) -> pd.Series:
+    def to_stamp(col: str) -> pd.Series:
         # Suppress the dateutil warning by being more specific
         with pd.option_context('mode.chained_assignment', None):
-            return (pd.to_datetime(df[col].astype(str), errors="coerce", format='mixed')
-                    .dt.time.fillna(datetime.time.min))
+            return pd.to_datetime(df[col].astype(str), errors="coerce", format='mixed')
 
+    # Keep datetime.time for the Excel output, plus an int16 minutes-of-day
+    # twin ("<col>_m") so comparisons stay vectorised integer ops.
     for col in ("Begin Time", "End Time", "Class Time"):
-        df[col] = to_time(col)
+        stamps = to_stamp(col)
+        df[col] = stamps.dt.time.fillna(datetime.time.min)
+        df[f"{col}_m"] = (stamps.dt.hour * 60 + stamps.dt.minute).fillna(0).astype("int16")
 
     return df
 
+def accommodation_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """One boolean column per KEYWORDS entry, scanned once for the roster."""
+    acc = df["Test Accommodation"]
+    return pd.DataFrame({key: acc.str.contains(pattern, na=False)
+                         for key, pattern in KEYWORD_RES.items()}, index=df.index)
+
 # ─────────────────────── Seat-assignment engine ─────────────────────────────
 def assign_students(df: pd.DataFrame, seat_pool: list[str]
                     ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Greedy, stable assignment of students to seats without overlapping times:
     adjustable-desk requests are placed first; within each sub-group students
-    are processed in chronological order.  The pool is shuffled every pass
-    for fairness.
+    are processed in chronological order.  Seats sit in a min-heap keyed on
+    the minute they become free, so each student takes the earliest-free
+    seat in O(log K); a random tiebreak in the key keeps it fair.
     """
-    availability = {s: datetime.time.min for s in seat_pool}
-    rng          = np.random.default_rng()
-    placed, left = [], []
+    availability = dict.fromkeys(seat_pool, 0)          # minutes since midnight, per pass
+    placed, rooms, left = [], [], []
+    adj_pool     = [s for s in seat_pool if s in ADJUSTABLE_SEATS]
+    full_pool    = list(seat_pool)
 
     for needs_adj in (True, False):
+        valid = adj_pool if needs_adj else full_pool
+        heap  = [(availability[s], key, s)
+                 for s, key in zip(valid, RNG.random(len(valid)).tolist())]
+        heapq.heapify(heap)
+
         group = df[df["Requires Adjustable"] == needs_adj]\
-                  .sort_values("Begin Time")
-        for _, stu in group.iterrows():
-            valid = [s for s in seat_pool
-                     if (not needs_adj or SEATS[s]["adjustable"])]
-            rng.shuffle(valid)
-
-            for seat in valid:
-                if stu["Begin Time"] >= availability[seat]:
-                    availability[seat] = stu["End Time"]
-                    placed.append({**stu, "Test Room": seat})
-                    break
+                  .sort_values("Begin Time_m")
+        # Plain Python ints/floats: heap comparisons on NumPy scalars are slow,
+        # and the tiebreak keys are drawn in one call instead of per student
+        for idx, begin, end, key in zip(group.index,
+                                        group["Begin Time_m"].tolist(),
+                                        group["End Time_m"].tolist(),
+                                        RNG.random(len(group)).tolist()):
+            if heap and heap[0][0] <= begin:
+                seat = heap[0][2]
+                heapq.heapreplace(heap, (end, key, seat))
+                placed.append(idx)
+                rooms.append(seat)
             else:
-                left.append(stu)
+                left.append(idx)
 
-    return pd.DataFrame(placed), pd.DataFrame(left)
+        # The heap already holds every seat's free-from minute; carry it over
+        # to the next pass here instead of writing the dict on each placement
+        availability.update((seat, free) for free, _, seat in heap)
+
+    return df.loc[placed].assign(**{"Test Room": rooms}), df.loc[left]
 
 # ───────────────────────────── Constants and helpers ──────────────────────────────────
-def _set_cell(ws, row, col, value, *, fill_hex=None):
+def _add_time_style(wb) -> str:
+    """Register TIME_STYLE on *wb* (once) and return its name."""
+    if TIME_STYLE not in wb.named_styles:
+        wb.add_named_style(NamedStyle(name=TIME_STYLE, number_format=TIME_FORMAT_EXCEL))
+    return TIME_STYLE
+
+def _seat_numbers(test_rooms: pd.Series) -> pd.Series:
+    """Seat number for every Test Room, straight from the catalogue."""
+    seat_numbers = test_rooms.astype(object).map(SEAT_NUMBER_LUT)
+    unknown = test_rooms[test_rooms.notna() & seat_numbers.isna()].unique()
+    if len(unknown):                  # rooms only ever come from SEATS
+        log.warning(f"⚠️  Not in the seat catalogue (no seat number): {', '.join(map(str, unknown))}")
+    return seat_numbers
+
+def _column_widths(written: dict[int, pd.Series], headers: dict[int, object],
+                   n_cols: int) -> dict[int, int]:
     """
-    Write *value* into (row, col), prettify if it's a time,
-    and optionally apply a background fill colour.
+    Column widths from the data about to be written (one vectorised
+    ``str.len`` per column): longest value or header + 2, clipped to
+    [MIN_COL_WIDTH, 50].  Columns that receive no data (or only blanks)
+    get MIN_COL_WIDTH.
     """
-    cell = ws.cell(row=row, column=col, value=value)
+    widths = {}
+    for col in range(1, n_cols + 1):
+        values = written.get(col)
+        values = None if values is None else values.dropna()
+        if values is None or values.empty:
+            widths[col] = MIN_COL_WIDTH
+            continue
+        header  = headers.get(col)
+        longest = max(values.astype(str).str.len().max(), len(str(header)) if header else 0)
+        widths[col] = int(min(max(longest + 2, MIN_COL_WIDTH), 50))
+    return widths
 
-    # Make times human-readable in Excel
-    if isinstance(value, datetime.time):
-        cell.number_format = TIME_FORMAT_EXCEL
+def _save_atomically(out_path: pathlib.Path, write) -> None:
+    """
+    Call ``write(tmp)`` on a sibling ``.tmp`` file, then ``os.replace`` it
+    onto *out_path* so readers never see a half-written ZIP.
+    """
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, out_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def _layout(df: pd.DataFrame, assignment_type: str,
+            test_room_col: int, seat_number_col: int
+            ) -> tuple[dict[int, pd.Series], list[list], list]:
+    """
+    Lay *df* out on the sheet's columns as plain values.  Returns the
+    per-column data (for ``_column_widths``), the rows, and per row the room
+    type of its Test Room cell (None when the row gets no room).
+    """
+    frame = df.reindex(columns=[*STUDENT_COLUMNS.values(), "Test Room"])
+    frame = frame.astype(object).where(frame.notna(), None)     # NaN → blank cell
+    seat_numbers = _seat_numbers(frame["Test Room"])
+    room_types   = SEAT_TYPE_LUT.reindex(frame["Test Room"], fill_value="reg").to_numpy()
+    assigned     = assignment_type == "ASSIGNED"
+
+    written = {col: frame[field] for col, field in STUDENT_COLUMNS.items() if field in df}
+    if assigned and "Test Room" in df:
+        written[test_room_col]   = frame["Test Room"]
+        written[seat_number_col] = seat_numbers
+
+    n_cols = max(*STUDENT_COLUMNS, test_room_col, seat_number_col)
+
+    # Column-wise Python lists zipped back into rows: no per-row Series or
+    # namedtuple, and each field's slot is resolved once up front
+    slots    = [col - 1 for col in STUDENT_COLUMNS]
+    columns  = [frame[field].tolist() for field in STUDENT_COLUMNS.values()]
+    seat_nos = seat_numbers.astype(object).where(seat_numbers.notna(), None).tolist()
+
+    rows, row_types = [], []
+    for values, test_room, seat_no, room_type in zip(
+            zip(*columns), frame["Test Room"].tolist(), seat_nos, room_types):
+        row = [None] * n_cols
+        for slot, value in zip(slots, values):
+            row[slot] = value
+        if assigned and test_room is not None:
+            row[test_room_col - 1] = test_room
+            if seat_no is not None:
+                row[seat_number_col - 1] = seat_no
+        else:
+            room_type = None
+        rows.append(row)
+        row_types.append(room_type)
 
-    # Shade the cell if a colour was supplied
-    if fill_hex:
-        cell.fill = PatternFill("solid", fgColor=fill_hex)
+    return written, rows, row_types
 
-    return cell
+def _data_rows(ws, df: pd.DataFrame, assignment_type: str,
+               test_room_col: int, seat_number_col: int, time_style: str
+               ) -> tuple[dict[int, pd.Series], Iterator[list]]:
+    """
+    ``_layout`` for openpyxl: a generator of row lists for ``ws.append`` in
+    which times and rooms are ``WriteOnlyCell``s sharing one style/fill
+    instance each.
+    """
+    written, rows, row_types = _layout(df, assignment_type, test_room_col, seat_number_col)
+    time_slots = [col - 1 for col in TIME_COLUMNS]
+    room_slot  = test_room_col - 1
+
+    def cells() -> Iterator[list]:
+        for row, room_type in zip(rows, row_types):
+            for slot in time_slots:
+                cell = WriteOnlyCell(ws, value=row[slot])
+                cell.style = time_style
+                row[slot] = cell
+            if room_type is not None:
+                cell = WriteOnlyCell(ws, value=row[room_slot])
+                fill = FILL_BY_TYPE.get(room_type)
+                if fill is not None:
+                    cell.fill = fill
+                row[room_slot] = cell
+            yield row
+
+    return written, cells()
+
+def _fill_rows(ws, df: pd.DataFrame, assignment_type: str,
+               test_room_col: int, seat_number_col: int) -> dict[int, pd.Series]:
+    """
+    ``_layout`` for a template sheet: values go into the existing cells under
+    the header so they keep the template's formatting (prepare_template has
+    already given the time columns TIME_FORMAT_EXCEL); rooms get their type's
+    shared fill on top.
+    """
+    written, rows, row_types = _layout(df, assignment_type, test_room_col, seat_number_col)
+    if not rows:
+        return written
+    room_slot = test_room_col - 1
+    cells = ws.iter_rows(min_row=HDR_ROW + 1, max_row=HDR_ROW + len(rows),
+                         max_col=len(rows[0]))
+
+    for row, room_type, row_cells in zip(rows, row_types, cells):
+        for cell, value in zip(row_cells, row):
+            if value is not None:
+                cell.value = value
+        if room_type in FILL_BY_TYPE:
+            row_cells[room_slot].fill = FILL_BY_TYPE[room_type]
+
+    return written
+
+def _apply_widths(ws, written: dict[int, pd.Series], headers: dict[int, object],
+                  n_cols: int) -> None:
+    for col, width in _column_widths(written, headers, n_cols).items():
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+# ───────────────────────────── Template-less workbook ──────────────────────────────
+def _stream_basic_workbook(sheets: dict[str, pd.DataFrame], out_path: pathlib.Path) -> None:
+    """
+    Write a fresh workbook in openpyxl write-only mode, one sheet per entry
+    of *sheets*: rows are built as plain lists and streamed with
+    ``ws.append`` instead of addressing every cell through ``ws.cell``.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    time_style = _add_time_style(wb)
+    for kind, df in sheets.items():
+        ws = wb.create_sheet(kind)
+        written, rows = _data_rows(ws, df, kind,
+                                   HEADERS.index("Test Room") + 1,
+                                   HEADERS.index("Seat Number") + 1,
+                                   time_style)
+
+        # Widths must be known before the first row is streamed
+        _apply_widths(ws, written, dict(enumerate(HEADERS, start=1)), len(HEADERS))
+        ws.append([])                 # row 1 is left blank, as in the template
+        ws.append(HEADERS)
+        for row in rows:
+            ws.append(row)
+
+    _save_atomically(out_path, wb.save)
+
+def _excelerate_workbook(sheets: dict[str, pd.DataFrame], out_path: pathlib.Path) -> None:
+    """
+    Same layout as _stream_basic_workbook (time format, room fills, widths)
+    but written with pyexcelerate, which serialises far faster than openpyxl
+    when there is no template to preserve.
+    """
+    wb = pyexcelerate.Workbook()
+    time_style = pyexcelerate.Style(format=pyexcelerate.Format(TIME_FORMAT_EXCEL))
+    fill_styles = {t: pyexcelerate.Style(fill=pyexcelerate.Fill(
+                       background=pyexcelerate.Color(*bytes.fromhex(c))))
+                   for t, c in COLOR_BY_TYPE.items() if c}
+    test_room_col = HEADERS.index("Test Room") + 1
+    first_row     = HDR_ROW + 1
+
+    for kind, df in sheets.items():
+        written, rows, row_types = _layout(df, kind, test_room_col,
+                                           HEADERS.index("Seat Number") + 1)
+        ws = wb.new_sheet(kind, data=[[], list(HEADERS), *rows])
+        for excel_row, room_type in enumerate(row_types, start=first_row):
+            for col in TIME_COLUMNS:
+                ws.set_cell_style(excel_row, col, time_style)
+            if room_type in fill_styles:
+                ws.set_cell_style(excel_row, test_room_col, fill_styles[room_type])
+        widths = _column_widths(written, dict(enumerate(HEADERS, start=1)), len(HEADERS))
+        for col, width in widths.items():
+            ws.set_col_style(col, pyexcelerate.Style(size=width))
+
+    _save_atomically(out_path, lambda tmp: wb.save(str(tmp)))
 
 # ───────────────────────────── Enhanced Excel output helper ──────────────────────────────
-def write_excel(df: pd.DataFrame, name: str,
-                template: str | None,
-                out_dir: str | pathlib.Path,
-                assignment_type: str = "ASSIGNED") -> None:
-
-    out_path = pathlib.Path(out_dir) / f"{name}.xlsx"
+def _template_sheet(wb):
+    """Use the "Master" sheet, fall back to the active sheet if not found."""
+    return wb["Master"] if "Master" in wb.sheetnames else wb.active
+
+def _clone_sheet(wb, ws, title: str):
+    """copy_worksheet plus the view/filter/formatting bits it leaves behind."""
+    clone = wb.copy_worksheet(ws)
+    clone.title          = title
+    clone.freeze_panes   = ws.freeze_panes
+    clone.auto_filter.ref = ws.auto_filter.ref
+    for cf in ws.conditional_formatting:
+        for rule in cf.rules:
+            clone.conditional_formatting.add(str(cf.sqref), rule)
+    return clone
+
+def prepare_template(template: bytes) -> bytes:
+    """
+    Clean the template once per run: blank its sample data (keeping each
+    row's borders, wrap and height), give the time columns TIME_FORMAT_EXCEL
+    and make sure the "Test Room" / "Seat Number" headers exist.  Every
+    workbook is then built from these bytes and has nothing left to clear
+    or format per row.
+    """
+    wb = openpyxl.load_workbook(io.BytesIO(template))
+    ws = _template_sheet(wb)
 
-    # ── 1  Set up the workbook ────────────────────────────────────────────────
-    if template:
-        shutil.copy(template, out_path)
-        wb = openpyxl.load_workbook(out_path)
-        # Try to use "Master" sheet, fall back to active sheet if not found
-        try:
-            ws = wb["Master"]
-        except KeyError:
-            ws = wb.active
-    else:
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        # Create basic headers if no template
-        headers = ['Begin Time', 'End Time', 'Student Number', 'Student Last Name', 'Student First Name',
-                  'Check-IN Time', 'Check-OUT Time', 'Course', 'Code', 'Test Room', 'Seat Number', 
-                  'Faculty Name', 'Class Time', 'Test Accommodation', 'Invigilator Comment', 'Test Comment']
-        for col_idx, header in enumerate(headers, start=1):
-            ws.cell(row=2, column=col_idx, value=header)
-
-    # ── 2  Locate or create "Test Room" & "Seat Number" columns ───────────────
-    hdr_row      = 2
-    headers      = {ws.cell(hdr_row, col).value: col for col in range(1, ws.max_column+1)}
+    headers         = {ws.cell(HDR_ROW, col).value: col for col in range(1, ws.max_column+1)}
     test_room_col   = headers.get("Test Room")  or ws.max_column + 1
     seat_number_col = headers.get("Seat Number") or (test_room_col + 1)
+    ws.cell(HDR_ROW, test_room_col,   "Test Room")
+    ws.cell(HDR_ROW, seat_number_col, "Seat Number")
+
+    time_slots = [col - 1 for col in TIME_COLUMNS]
+    for row in ws.iter_rows(min_row=HDR_ROW + 1, max_row=ws.max_row,
+                            max_col=max(ws.max_column, *TIME_COLUMNS)):
+        for cell in row:
+            cell.value = None   # wipe values & formula results
+        for slot in time_slots:
+            row[slot].number_format = TIME_FORMAT_EXCEL
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+def write_cohort(sheets: dict[str, pd.DataFrame], name: str,
+                 template: bytes | None,
+                 out_dir: str | pathlib.Path) -> None:
+    """
+    Write one workbook per cohort with a sheet per variant (PROCESSED /
+    ASSIGNED / NOT_ASSIGNED → frame); *template* is the output of
+    prepare_template.
+    """
+    out_path = pathlib.Path(out_dir) / f"{name}.xlsx"
+    counts   = ", ".join(f"{kind} {len(df)}" for kind, df in sheets.items())
 
-    ws.cell(hdr_row, test_room_col,   "Test Room")
-    ws.cell(hdr_row, seat_number_col, "Seat Number")
-
-    # ── 3  Clear previous data completely ────────────────────────────────────
-    if ws.max_row > hdr_row:
-        for row in ws.iter_rows(min_row=hdr_row + 1, max_row=ws.max_row):
-            for cell in row:
-                cell.value = None   # wipe values & formula results
-
-    # ── 4  Write this cohort's data ───────────────────────────────────────────
-    for excel_row, (_, stu) in enumerate(df.iterrows(), start=hdr_row + 1):
-
-        # Core student columns
-        _set_cell(ws, excel_row, 1,  stu.get('Begin Time'))          # Begin Time
-        _set_cell(ws, excel_row, 2,  stu.get('End Time'))            # End Time
-        _set_cell(ws, excel_row, 3,  stu.get('Student Number'))
-        _set_cell(ws, excel_row, 4,  stu.get('Student Last Name'))
-        _set_cell(ws, excel_row, 5,  stu.get('Student First Name'))
-        _set_cell(ws, excel_row, 8,  stu.get('Course'))
-        _set_cell(ws, excel_row, 9,  stu.get('Code'))
-        _set_cell(ws, excel_row, 12, stu.get('Faculty Name'))
-        _set_cell(ws, excel_row, 13, stu.get('Class Time'))
-        _set_cell(ws, excel_row, 14, stu.get('Test Accommodation'))
-
-        # ----------  Test Room & Seat Number  ----------
-        if assignment_type == "ASSIGNED" and pd.notna(stu.get('Test Room')):
-            test_room = stu['Test Room']
-
-            # Pick colour based on room type
-            seat_type = SEATS.get(test_room, {}).get("type", "reg")
-            fill_hex  = COLOR_BY_TYPE.get(seat_type)
-
-            _set_cell(ws, excel_row, test_room_col, test_room, fill_hex=fill_hex)
-
-            # Seat number logic unchanged
-            seat_no = (SEATS.get(test_room, {}).get("seat_number")
-                       or re.search(r"\b(?:Seat|WS|Room|SAS) (\d+)", test_room))
-            if seat_no:
-                _set_cell(ws, excel_row, seat_number_col,
-                          seat_no.group(1) if hasattr(seat_no, "group") else seat_no)
-
-    # ── 5  Adjust widths, save, done ─────────────────────────────────────────
-    for column in ws.columns:
-        letter = get_column_letter(column[0].column)
-        if all(cell.value is None for cell in column[2:]):
-            ws.column_dimensions[letter].width = MIN_COL_WIDTH
-            continue
-        max_len = max(len(str(cell.value)) for cell in column if cell.value)
-        ws.column_dimensions[letter].width = min(max_len + 2, 50)
+    # No template → nothing to preserve: pyexcelerate if installed, else a
+    # streamed openpyxl write-only workbook
+    if not template:
+        if pyexcelerate is not None:
+            _excelerate_workbook(sheets, out_path)
+        else:
+            _stream_basic_workbook(sheets, out_path)
+        print(f"📄  Saved {out_path.name}  ({counts})")
+        return
+
+    # ── 1  Set up the workbook (from the pre-cleared template bytes) ──────────
+    wb = openpyxl.load_workbook(io.BytesIO(template))
+    master = _template_sheet(wb)
+
+    # ── 2  Locate the "Test Room" & "Seat Number" columns ─────────────────
+    headers         = {master.cell(HDR_ROW, col).value: col for col in range(1, master.max_column+1)}
+    test_room_col   = headers["Test Room"]
+    seat_number_col = headers["Seat Number"]
+    header_row      = {cell.column: cell.value for cell in master[HDR_ROW]}
+
+    # ── 3  One empty copy of the template sheet per variant, in place ─────
+    position = wb.index(master)
+    targets  = [master] + [_clone_sheet(wb, master, kind) for kind in list(sheets)[1:]]
+    for offset, (ws, kind) in enumerate(zip(targets, sheets)):
+        ws.title = kind
+        wb.move_sheet(ws, position + offset - wb.index(ws))
+
+    # ── 4  Rows into the template's own (styled) rows, then widths ───────
+    for ws, (kind, df) in zip(targets, sheets.items()):
+        written = _fill_rows(ws, df, kind, test_room_col, seat_number_col)
+        _apply_widths(ws, written, header_row, master.max_column)
+
+    _save_atomically(out_path, wb.save)
+    print(f"📄  Saved {out_path.name}  ({counts})")
 
-    wb.save(out_path)
-    print(f"📄  Saved {out_path.name}  ({len(df)} rows)")
+
+def _write_cohort_task(job: tuple) -> None:
+    """ProcessPoolExecutor entry point – one write_cohort call per job."""
+    write_cohort(*job)
 
 # ─────────────────────────────── Main ───────────────────────────────────────
 def main() -> None:
+    # 0  Cohort/seat-pool tracing only with --verbose or SEAT_DEBUG=1
+    verbose = "--verbose" in sys.argv[1:] or os.environ.get("SEAT_DEBUG") == "1"
+    logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.INFO)
+    if verbose:                       # our trace only, not every library's
+        log.setLevel(logging.DEBUG)
+
+    # One hidden Tk root for every dialog (terminal prompts if there's no display)
+    try:
+        _ensure_root()
+    except tk.TclError:
+        pass
+
     # 1  Pick the roster
     data = pick_file("Select your Excel/CSV roster",
                      (("Excel/CSV", "*.xlsx *.xls *.csv"),))
@@ -365,21 +671,21 @@ def main() -> None:
         )
         
         if use_default_template:
-            template_path = pathlib.Path(__file__).parent / "May 5, 2025.xlsx"
-            if template_path.exists():
-                template = str(template_path)
+            if DEFAULT_TEMPLATE.is_file():
+                template = str(DEFAULT_TEMPLATE)
                 print(f"📋 Using default template: {template}")
             else:
-                print("❌ May 5, 2025.xlsx not found in current directory")
-                template = pick_file("Select an .xlsx template",
-                                   (("Excel", "*.xlsx *.xls"),))
-        else:
+                print(f"❌ {DEFAULT_TEMPLATE.name} not found in current directory")
+        if not template:
             template = pick_file("Select an .xlsx template",
                                (("Excel", "*.xlsx *.xls"),))
         
         if not template:
             print("No template chosen; Excel outputs will be basic workbooks.")
 
+    # Read and clear the template once; every workbook is then parsed from memory
+    template_bytes = prepare_template(pathlib.Path(template).read_bytes()) if template else None
+
     # 4  Select room types
     room_preferences = choose_room_preferences()
 
@@ -392,80 +698,72 @@ def main() -> None:
     df = read_source(data)
 
     # 7  Cohort splits - Sequential building to avoid overlaps
-    print("🔍 Building cohorts sequentially...")
-    print(f"📋 Total students in roster: {len(df)}")
-    
-    # Start with all students
-    remaining = df.copy()
+    log.debug("🔍 Building cohorts sequentially...")
+    log.debug(f"📋 Total students in roster: {len(df)}")
     
+    # Classify every accommodation once; each split just indexes the flags
+    flags = accommodation_flags(df)
+
+    # One boolean array per cohort; `taken` accumulates what earlier
+    # (higher-priority) cohorts already claimed, so nothing is copied or dropped
+    taken = np.zeros(len(df), dtype=bool)
+    trace = log.isEnabledFor(logging.DEBUG)   # remaining counts cost a pass each
+
+    def claim(name, mask):
+        nonlocal taken
+        mask = np.asarray(mask, dtype=bool) & ~taken
+        taken |= mask
+        part = df[mask]
+        if trace:
+            log.debug(f"   {name}: {len(part)} students (remaining: {(~taken).sum()})")
+        return part
+
     # Sequential cohort building
-    print("\n🔄 Building cohorts sequentially...")
+    log.debug("\n🔄 Building cohorts sequentially...")
     
     # DF1_PR - Private Room (highest priority)
-    pr_mask = remaining["Test Accommodation"].str.contains("Private Room", case=False, na=False)
-    DF1_PR = remaining[pr_mask]
-    remaining = remaining.drop(DF1_PR.index)
-    print(f"   DF1_PR: {len(DF1_PR)} students (remaining: {len(remaining)})")
+    DF1_PR = claim("DF1_PR", flags["pr"])
     
     # DF2_WS - Workstation needs
-    ws_mask = remaining["Test Accommodation"].str.contains(r"Read and Write|MS Word|Kurzweil", case=False, na=False)
-    DF2_WS = remaining[ws_mask]
-    remaining = remaining.drop(DF2_WS.index)
-    print(f"   DF2_WS: {len(DF2_WS)} students (remaining: {len(remaining)})")
+    DF2_WS = claim("DF2_WS", flags["ws"])
     
     # DF3_HAD - Height Adjustable Desks
-    DF3_HAD = remaining[remaining["Requires Adjustable"]]
-    remaining = remaining.drop(DF3_HAD.index)
-    print(f"   DF3_HAD: {len(DF3_HAD)} students (remaining: {len(remaining)})")
+    DF3_HAD = claim("DF3_HAD", df["Requires Adjustable"])
     
     # DF4_SCRIBE - Scribe needs
-    scribe_mask = remaining["Test Accommodation"].str.contains("Scribe", case=False, na=False)
-    DF4_SCRIBE = remaining[scribe_mask]
-    remaining = remaining.drop(DF4_SCRIBE.index)
-    print(f"   DF4_SCRIBE: {len(DF4_SCRIBE)} students (remaining: {len(remaining)})")
+    DF4_SCRIBE = claim("DF4_SCRIBE", flags["scribe"])
     
     # DF6_FINAL - Final exams
-    final_mask = remaining["Test Accommodation"].str.contains("Final", case=False, na=False)
-    DF6_FINAL = remaining[final_mask]
-    remaining = remaining.drop(DF6_FINAL.index)
-    print(f"   DF6_FINAL: {len(DF6_FINAL)} students (remaining: {len(remaining)})")
+    DF6_FINAL = claim("DF6_FINAL", flags["final"])
     
     # DF7_ES - Evening Students
-    end_time_22 = remaining["End Time"].apply(lambda t: t.hour == 22 if hasattr(t, 'hour') else False)
-    begin_before_class = remaining["Begin Time"] < remaining["Class Time"]
-    es_mask = end_time_22 & begin_before_class
-    DF7_ES = remaining[es_mask]
-    remaining = remaining.drop(DF7_ES.index)
-    print(f"   DF7_ES: {len(DF7_ES)} students (remaining: {len(remaining)})")
+    end_time_22 = df["End Time_m"].to_numpy() // 60 == 22
+    begin_before_class = df["Begin Time_m"].to_numpy() < df["Class Time_m"].to_numpy()
+    DF7_ES = claim("DF7_ES", end_time_22 & begin_before_class)
     
     # ---------- SAS offices (must run BEFORE we create MAIN) --------------------
     if room_preferences['sas_offices']:
-        sas_mask = remaining["Test Accommodation"].str.contains(
-            r"SAS|Special|Individual|Separate|Extra Time|Alternative|Modified",
-            case=False, na=False
-        )
-        DF8_SAS = remaining[sas_mask]
-        remaining = remaining.drop(DF8_SAS.index)
-        print(f"   DF8_SAS: {len(DF8_SAS)} students (remaining: {len(remaining)})")
+        DF8_SAS = claim("DF8_SAS", flags["sas"])
     else:
         DF8_SAS = pd.DataFrame()
-        print(f"   DF8_SAS: {len(DF8_SAS)} students (SAS offices disabled)")
+        log.debug(f"   DF8_SAS: {len(DF8_SAS)} students (SAS offices disabled)")
 
     # ---------- DF5_MAIN – whatever is still unhandled --------------------------
-    DF5_MAIN = remaining.copy()
-    remaining = remaining.drop(DF5_MAIN.index)
-    print(f"   DF5_MAIN: {len(DF5_MAIN)} students (remaining: {len(remaining)})")
+    DF5_MAIN = claim("DF5_MAIN", ~taken)
 
     # ---------- DF9_CLASSROOMS – absolute leftovers -----------------------------
-    DF9_CLASSROOMS = remaining.copy()
-    print(f"   DF9_CLASSROOMS: {len(DF9_CLASSROOMS)} students")
+    DF9_CLASSROOMS = df[~taken]
+    log.debug(f"   DF9_CLASSROOMS: {len(DF9_CLASSROOMS)} students")
     
-    # Verify no overlaps
-    total_in_cohorts = len(DF1_PR) + len(DF2_WS) + len(DF3_HAD) + len(DF4_SCRIBE) + len(DF5_MAIN) + len(DF6_FINAL) + len(DF7_ES) + len(DF8_SAS) + len(DF9_CLASSROOMS)
-    print(f"\n📊 Cohort verification:")
-    print(f"   Total students in cohorts: {total_in_cohorts}")
-    print(f"   Original roster size: {len(df)}")
-    print(f"   ✅ No overlaps: {total_in_cohorts == len(df)}")
+    # Verify no overlaps (only worth the extra passes when debugging)
+    if trace:
+        total_in_cohorts = sum(len(part) for part in (
+            DF1_PR, DF2_WS, DF3_HAD, DF4_SCRIBE, DF5_MAIN,
+            DF6_FINAL, DF7_ES, DF8_SAS, DF9_CLASSROOMS))
+        log.debug(f"\n📊 Cohort verification:")
+        log.debug(f"   Total students in cohorts: {total_in_cohorts}")
+        log.debug(f"   Original roster size: {len(df)}")
+        log.debug(f"   ✅ No overlaps: {total_in_cohorts == len(df)}")
 
     splits = {
         "DF1_PR": DF1_PR, "DF2_WS": DF2_WS, "DF3_HAD": DF3_HAD,
@@ -473,54 +771,51 @@ def main() -> None:
         "DF6_FINAL": DF6_FINAL, "DF7_ES": DF7_ES, "DF8_SAS": DF8_SAS, "DF9_CLASSROOMS": DF9_CLASSROOMS
     }
     
+    # Workbooks are queued by output name and written together at the end
+    excel_jobs: dict[str, dict[str, pd.DataFrame]] = {}   # cohort → {sheet kind: frame}
     if want_excel:
-        print("📊 Generating cohort analysis files...")
         for name, part in splits.items():
-            write_excel(part, name, template, out, "PROCESSED")
+            excel_jobs[name] = {"PROCESSED": part}
 
     # 8  Build seat pools based on user preferences
     seat_pools = {}
     
     # --- Private rooms (main building) -----------------------------------------
     if room_preferences['private_rooms']:
-        seat_pools['private_rooms'] = [s for s in SEATS
-                                       if SEATS[s]["type"] == "pr"
-                                       and not s.startswith("CC Room")]
-        print(f"✅ Main-building private rooms: {len(seat_pools['private_rooms'])} seats")
+        seat_pools['private_rooms'] = list(MAIN_PR)
+        log.debug(f"✅ Main-building private rooms: {len(seat_pools['private_rooms'])} seats")
     else:
         seat_pools['private_rooms'] = []
 
     # --- Campus Corners --------------------------------------------------------
     if room_preferences.get('campus_corners', False):
-        cc_rooms = [s for s in SEATS if s.startswith("CC Room")]
-        seat_pools['private_rooms'].extend(cc_rooms)      # piggy-back on same pool
-        print(f"✅ Campus Corners rooms added: {len(cc_rooms)} seats")
+        seat_pools['private_rooms'].extend(CC_ROOMS)      # piggy-back on same pool
+        log.debug(f"✅ Campus Corners rooms added: {len(CC_ROOMS)} seats")
     
     if room_preferences['workstations']:
-        seat_pools['workstations'] = [s for s in SEATS if SEATS[s]["type"] == "ws"]
-        print(f"✅ Workstations enabled: {len(seat_pools['workstations'])} seats")
+        seat_pools['workstations'] = list(SEATS_BY_TYPE.get("ws", ()))
+        log.debug(f"✅ Workstations enabled: {len(seat_pools['workstations'])} seats")
     
     if room_preferences['regular_seats']:
-        seat_pools['regular_seats'] = [s for s in SEATS if SEATS[s]["type"] == "reg"]
-        print(f"✅ Regular seats enabled: {len(seat_pools['regular_seats'])} seats")
+        seat_pools['regular_seats'] = list(SEATS_BY_TYPE.get("reg", ()))
+        log.debug(f"✅ Regular seats enabled: {len(seat_pools['regular_seats'])} seats")
     
     if room_preferences['sas_offices']:
-        seat_pools['sas_offices'] = [s for s in SEATS if SEATS[s]["type"] == "sas"]
-        print(f"✅ SAS offices enabled: {len(seat_pools['sas_offices'])} seats")
+        seat_pools['sas_offices'] = list(SEATS_BY_TYPE.get("sas", ()))
+        log.debug(f"✅ SAS offices enabled: {len(seat_pools['sas_offices'])} seats")
 
     if room_preferences['sha_classrooms']:
-        seat_pools['sha_classrooms'] = [s for s in SEATS if SEATS[s]["type"] == "sha"]
-        print(f"✅ SHA classrooms enabled: {len(seat_pools['sha_classrooms'])} seats")
+        seat_pools['sha_classrooms'] = list(SEATS_BY_TYPE.get("sha", ()))
+        log.debug(f"✅ SHA classrooms enabled: {len(seat_pools['sha_classrooms'])} seats")
 
     # Collect all adjustable seats from the enabled pools
     adjustable_sources = []
     for pool_name in ("private_rooms", "workstations", "regular_seats",
                       "sas_offices", "sha_classrooms"):
         adjustable_sources.extend(seat_pools.get(pool_name, []))
-    seat_pools['adjustable_seats'] = [s for s in adjustable_sources
-                                      if SEATS[s]["adjustable"]]
+    seat_pools['adjustable_seats'] = [s for s in adjustable_sources if s in ADJUSTABLE_SEATS]
     if seat_pools['adjustable_seats']:
-        print(f"✅ Adjustable seats available: {len(seat_pools['adjustable_seats'])} seats")
+        log.debug(f"✅ Adjustable seats available: {len(seat_pools['adjustable_seats'])} seats")
 
     # 9  Seat-assignment cohorts
     cohorts = {}
@@ -553,28 +848,20 @@ def main() -> None:
     if room_preferences['sha_classrooms'] and len(DF9_CLASSROOMS) > 0:
         cohorts["DF9_CLASSROOMS"] = (DF9_CLASSROOMS, seat_pools['sha_classrooms'])
 
-    # Ensure every cohort – even empty ones – has its three workbooks
-    if want_excel:
-        for name, part in splits.items():
-            if (out_path := pathlib.Path(out, f"{name}.xlsx")).exists():
-                continue                         # raw workbook already written
-            write_excel(part, name,                template, out, "PROCESSED")
-            write_excel(part, f"{name}_ASSIGNED",  template, out, "ASSIGNED")
-            write_excel(part, f"{name}_NOT_ASSIGNED", template, out, "NOT_ASSIGNED")
-
     # 10  Process assignments with proper duplicate counting
     assigns: dict[str, dict[str, object]] = {}
-    seen = set()  # Track student numbers already placed
-    assigned_ids = set()  # Track all assigned student IDs
-    not_assigned_ids = set()  # Track all not-assigned student IDs
+    seen = pd.Index([])  # Student numbers already placed (hash-based isin)
+    assigned_ids: list[np.ndarray] = []      # per-cohort assigned student IDs
+    not_assigned_ids: list[np.ndarray] = []  # per-cohort not-assigned student IDs
     
     for name, (part, pool) in cohorts.items():
         print(f"🔄 Processing {name}: {len(part)} students, {len(pool)} seats available")
         assigned, not_assigned = assign_students(part, pool)
         
         # Guard against double-seating
-        assigned_unique = assigned[~assigned["Student Number"].isin(seen)]
-        double_seated = assigned[assigned["Student Number"].isin(seen)]
+        already_seated  = assigned["Student Number"].isin(seen).to_numpy()
+        assigned_unique = assigned[~already_seated]
+        double_seated   = assigned[already_seated]
         
         if len(double_seated) > 0:
             print(f"   ⚠️  Prevented double-seating: {len(double_seated)} students")
@@ -582,48 +869,54 @@ def main() -> None:
             not_assigned = pd.concat([not_assigned, double_seated], ignore_index=True)
         
         # Update tracking
-        seen.update(assigned_unique["Student Number"])
+        seen = seen.append(pd.Index(assigned_unique["Student Number"]))
         assigned = assigned_unique  # Use only unique assignments
         
-        # Track unique student IDs for proper counting (with safety checks)
+        # Keep the raw ID arrays; they are de-duplicated once for the summary
         if not assigned.empty:
-            assigned_ids.update(assigned["Student Number"])
+            assigned_ids.append(assigned["Student Number"].to_numpy())
         if not not_assigned.empty:
-            not_assigned_ids.update(not_assigned["Student Number"])
+            not_assigned_ids.append(not_assigned["Student Number"].to_numpy())
         
         print(f"   ✅ Assigned: {len(assigned)}, ❌ Not assigned: {len(not_assigned)}")
 
         if want_excel:
-            write_excel(assigned,     f"{name}_ASSIGNED",     template, out, "ASSIGNED")
-            write_excel(not_assigned, f"{name}_NOT_ASSIGNED", template, out, "NOT_ASSIGNED")
+            excel_jobs[name].update(ASSIGNED=assigned, NOT_ASSIGNED=not_assigned)
 
         # build JSON payload (with safety check)
         if not assigned.empty:
-            for _, row in assigned.iterrows():
-                assigns[row["Test Room"]] = {
-                    "student_number": int(row["Student Number"]),
-                    "last_name":      str(row["Student Last Name"]),
-                    "first_name":     str(row["Student First Name"]),
-                    "requiresAdjust": bool(row["Requires Adjustable"]),
+            for room, number, last, first, adjust in zip(
+                    *(assigned[col].tolist() for col in ("Test Room", "Student Number",
+                                                         "Student Last Name", "Student First Name",
+                                                         "Requires Adjustable"))):
+                assigns[room] = {
+                    "student_number": int(number),
+                    "last_name":      str(last),
+                    "first_name":     str(first),
+                    "requiresAdjust": bool(adjust),
                 }
 
-    # Handle empty cohorts - create empty ASSIGNED and NOT_ASSIGNED files for missing cohorts
+    # Handle empty cohorts - add empty ASSIGNED and NOT_ASSIGNED sheets for missing cohorts
     empty_cohorts = set(splits) - set(cohorts)
     for name in empty_cohorts:
         print(f"📝 Creating empty files for cohort: {name}")
         if want_excel:
-            write_excel(pd.DataFrame(), f"{name}_ASSIGNED",     template, out, "ASSIGNED")
-            write_excel(pd.DataFrame(), f"{name}_NOT_ASSIGNED", template, out, "NOT_ASSIGNED")
+            excel_jobs[name].update(ASSIGNED=pd.DataFrame(), NOT_ASSIGNED=pd.DataFrame())
+
+    # Each workbook is an independent file, so write them in parallel
+    if excel_jobs:
+        print(f"📊 Generating {len(excel_jobs)} Excel workbooks...")
+        with ProcessPoolExecutor() as ex:
+            list(ex.map(_write_cohort_task,
+                        [(sheets, name, template_bytes, out) for name, sheets in excel_jobs.items()]))
 
     # 11  Save JSON files and provide detailed summary
-    pathlib.Path(out, "seats.json").write_text(
-        json.dumps(SEATS, indent=2), encoding="utf-8")
-    pathlib.Path(out, "assigns.json").write_text(
-        json.dumps(assigns, indent=2), encoding="utf-8")
+    pathlib.Path(out, "seats.json").write_bytes(_json_bytes(SEATS))
+    pathlib.Path(out, "assigns.json").write_bytes(_json_bytes(assigns))
 
     # Calculate final totals using unique student counts
-    total_assigned = len(assigned_ids)
-    total_not_assigned = len(not_assigned_ids)
+    total_assigned = len(pd.unique(np.concatenate(assigned_ids))) if assigned_ids else 0
+    total_not_assigned = len(pd.unique(np.concatenate(not_assigned_ids))) if not_assigned_ids else 0
 
     # Print detailed completion summary
     print(f"\n✅  All done! Excel reports and JSON files generated in:")